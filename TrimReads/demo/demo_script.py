@@ -6,18 +6,53 @@ This script demonstrates the functionality of the TrimReads package
 using both simulated and real-world sequencing data.
 """
 
+import asyncio
+import contextlib
+import io
+import multiprocessing
 import os
-import gzip
-import random
+import shutil
 import tempfile
 import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
 from trimreads import trimreads, fastq_parser
 
+# Prefer ISA-L accelerated gzip when available
+try:
+    from isal import igzip as gzip_mod
+except ImportError:
+    import gzip as gzip_mod
+
+# Translation table mapping each Phred+33 character to its quality glyph.
+# Scores are bucketed at Q10/Q20/Q30 with a single searchsorted call.
+_GLYPHS = np.array(['▁', '▃', '▄', '▅'])
+_GLYPH_INDEX = np.searchsorted([10, 20, 30], np.arange(128) - 33, side='right')
+QUALITY_GLYPHS = str.maketrans(dict(zip(map(chr, range(128)), _GLYPHS[_GLYPH_INDEX].tolist())))
+
+def print_block(*lines):
+    """Print several lines with a single write to stdout"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
 def print_header(title):
     """Print a formatted header"""
-    print("\n" + "=" * 80)
-    print(f" {title} ".center(80, "="))
-    print("=" * 80 + "\n")
+    print_block("\n" + "=" * 80, f" {title} ".center(80, "="), "=" * 80 + "\n")
+
+@lru_cache(maxsize=16)
+def _quality_profile(read_length):
+    """
+    Build the Phred+33 quality line shared by every simulated read
+    
+    The profile depends only on position:
+    - High quality in the middle (Q30-40)
+    - Degraded at ends (Q0-20)
+    """
+    pos = np.arange(read_length)
+    pos_factor = np.minimum(np.minimum(pos, read_length - pos - 1) / (read_length / 2), 1.0)
+    base_quality = (20 + 20 * pos_factor).astype(np.int32)
+    return (base_quality + 33).astype(np.uint8).tobytes()
 
 def create_simulated_fastq(file_path, num_reads=1000, read_length=150):
     """
@@ -28,43 +63,40 @@ def create_simulated_fastq(file_path, num_reads=1000, read_length=150):
         num_reads: Number of reads to generate
         read_length: Length of each read
     """
-    bases = "ACGT"
+    quality = _quality_profile(read_length)
     
-    # Open file (handle gzip compression)
+    # Generate all random sequences in one call
+    rng = np.random.default_rng()
+    bases = np.frombuffer(b"ACGT", dtype=np.uint8)
+    sequences = bases[rng.integers(0, 4, size=(num_reads, read_length), dtype=np.uint8)]
+    
+    # Open file in binary mode (handle gzip compression)
     if file_path.endswith('.gz'):
-        f = gzip.open(file_path, 'wt')
+        f = gzip_mod.open(file_path, 'wb', compresslevel=1)
     else:
-        f = open(file_path, 'w')
+        f = open(file_path, 'wb')
     
     with f:
+        # Header lines and the shared separator/quality tail are built up front
+        headers = [b"@SIMULATED_READ_%d\n" % i for i in range(num_reads)]
+        tail = b"\n+\n" + quality + b"\n"
+        
+        # Accumulate records and flush in ~1 MiB chunks
+        buf = bytearray()
         for i in range(num_reads):
-            # Generate random sequence
-            sequence = ''.join(random.choices(bases, k=read_length))
-            
-            # Generate quality scores:
-            # - High quality in the middle (Q30-40)
-            # - Degraded at ends (Q0-20)
-            quality = []
-            for pos in range(read_length):
-                # Calculate position factor (0 at ends, 1 in middle)
-                pos_factor = min(pos, read_length - pos - 1) / (read_length / 2)
-                pos_factor = min(1.0, pos_factor)  # Cap at 1.0
-                
-                # Base quality: high in middle, low at ends
-                base_quality = int(20 + 20 * pos_factor)
-                quality.append(trimreads.score_to_phred(base_quality))
-            quality = ''.join(quality)
-            
-            # Write FASTQ record
-            f.write(f"@SIMULATED_READ_{i}\n")
-            f.write(f"{sequence}\n")
-            f.write("+\n")
-            f.write(f"{quality}\n")
+            buf.extend(headers[i])
+            buf.extend(sequences[i].tobytes())
+            buf.extend(tail)
+            if len(buf) >= 1 << 20:
+                f.write(buf)
+                buf.clear()
+        f.write(buf)
     
     print(f"Created simulated FASTQ file: {file_path}")
     print(f"  Reads: {num_reads}, Length: {read_length} bp")
 
-def run_trimming_demo(input_file, output_file, method="base", threshold=25, window_size=10):
+def run_trimming_demo(input_file, output_file, method="base", threshold=25, window_size=10,
+                      input_stats=None, threads=None):
     """
     Run a trimming demo and show results
     
@@ -74,7 +106,13 @@ def run_trimming_demo(input_file, output_file, method="base", threshold=25, wind
         method: "base" or "window" trimming
         threshold: Quality threshold
         window_size: Window size (for window method)
+        input_stats: Precomputed calculate_file_stats() result for input_file
+        threads: Trimming parallelism: OpenMP threads when the compiled extension
+            is built, worker processes otherwise (default: all CPUs)
     """
+    if threads is None:
+        threads = os.cpu_count() or 1
+    
     # Run trimming based on method
     if method == "base":
         print(f"Running base-by-base trimming with threshold Q{threshold}...")
@@ -82,7 +120,8 @@ def run_trimming_demo(input_file, output_file, method="base", threshold=25, wind
             input_file,
             output_file,
             base_threshold=threshold,
-            min_length=30
+            min_length=30,
+            threads=threads
         )
     elif method == "window":
         print(f"Running window-based trimming (window={window_size}bp, threshold Q{threshold})...")
@@ -91,7 +130,8 @@ def run_trimming_demo(input_file, output_file, method="base", threshold=25, wind
             output_file,
             window_size=window_size,
             window_threshold=threshold,
-            min_length=30
+            min_length=30,
+            threads=threads
         )
     else:
         print(f"Running combined base and window trimming...")
@@ -101,31 +141,54 @@ def run_trimming_demo(input_file, output_file, method="base", threshold=25, wind
             base_threshold=threshold,
             window_size=window_size,
             window_threshold=threshold,
-            min_length=30
+            min_length=30,
+            threads=threads
         )
     
     # Print summary statistics
-    print("\nTrimming Summary:")
-    print(f"  Total reads processed: {stats['total_reads']}")
-    print(f"  Reads passing filters: {stats['passed_reads']} "
-          f"({stats['passed_reads']/stats['total_reads']:.2%})")
-    print(f"  Reads discarded: {stats['discarded_reads']} "
-          f"({stats['discarded_reads']/stats['total_reads']:.2%})")
-    
-    # Calculate quality improvement
-    input_stats = fastq_parser.calculate_file_stats(input_file)
+    print_block(
+        "\nTrimming Summary:",
+        f"  Total reads processed: {stats['total_reads']}",
+        f"  Reads passing filters: {stats['passed_reads']} "
+        f"({stats['passed_reads']/stats['total_reads']:.2%})",
+        f"  Reads discarded: {stats['discarded_reads']} "
+        f"({stats['discarded_reads']/stats['total_reads']:.2%})"
+    )
+    
+    # Calculate quality improvement (input stats are reused when supplied)
+    if input_stats is None:
+        input_stats = fastq_parser.calculate_file_stats(input_file)
     output_stats = fastq_parser.calculate_file_stats(output_file)
     
-    print("\nQuality Improvement:")
-    print(f"  Average quality before: {input_stats['avg_quality']:.2f}")
-    print(f"  Average quality after:  {output_stats['avg_quality']:.2f}")
-    print(f"  Bases with Q<20 before: {input_stats['low_quality_bases']} "
-          f"({input_stats['low_quality_percent']:.2%})")
-    print(f"  Bases with Q<20 after:  {output_stats['low_quality_bases']} "
-          f"({output_stats['low_quality_percent']:.2%})")
+    print_block(
+        "\nQuality Improvement:",
+        f"  Average quality before: {input_stats['avg_quality']:.2f}",
+        f"  Average quality after:  {output_stats['avg_quality']:.2f}",
+        f"  Bases with Q<20 before: {input_stats['low_quality_bases']} "
+        f"({input_stats['low_quality_percent']:.2%})",
+        f"  Bases with Q<20 after:  {output_stats['low_quality_bases']} "
+        f"({output_stats['low_quality_percent']:.2%})"
+    )
     
     return stats
 
+def run_trimming_demo_captured(input_file, output_file, **kwargs):
+    """
+    Run a trimming demo in a worker process, capturing its report
+    
+    Args:
+        input_file: Input FASTQ file
+        output_file: Output trimmed FASTQ file
+        **kwargs: Passed through to run_trimming_demo
+        
+    Returns:
+        Tuple of (stats, printed report)
+    """
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        stats = run_trimming_demo(input_file, output_file, **kwargs)
+    return stats, report.getvalue()
+
 def visualize_quality_profiles(input_file, output_file):
     """
     Visualize quality profiles before and after trimming
@@ -143,32 +206,57 @@ def visualize_quality_profiles(input_file, output_file):
     print("          | | | | | | | | | |")
     
     for i, (in_rec, out_rec) in enumerate(zip(input_sample, output_sample)):
-        # Only show first 50 positions for clarity
-        in_qual = in_rec.quality[:50]
-        out_qual = out_rec.quality[:50]
-        
-        # Convert to scores for visualization
-        in_scores = [trimreads.phred_to_score(q) for q in in_qual]
-        out_scores = [trimreads.phred_to_score(q) for q in out_qual]
+        # Only show first 50 positions for clarity, mapped straight to glyphs
+        in_visual = in_rec.quality[:50].translate(QUALITY_GLYPHS)
+        out_visual = out_rec.quality[:50].translate(QUALITY_GLYPHS)
         
-        # Create visual representation
-        in_visual = ''.join('▅' if s >= 30 else '▄' if s >= 20 else '▃' if s >= 10 else '▁' for s in in_scores)
-        out_visual = ''.join('▅' if s >= 30 else '▄' if s >= 20 else '▃' if s >= 10 else '▁' for s in out_scores)
-        
-        print(f"\nRead {i+1} - Before Trimming:")
-        print(in_visual)
-        print(f"Read {i+1} - After Trimming:")
-        print(out_visual)
+        print_block(
+            f"\nRead {i+1} - Before Trimming:",
+            in_visual,
+            f"Read {i+1} - After Trimming:",
+            out_visual
+        )
     
     print("\nQuality Key:")
     print("▅ = Q≥30 (Excellent)  ▄ = Q20-29 (Good)  ▃ = Q10-19 (Marginal)  ▁ = Q<10 (Poor)")
 
-def download_real_data(output_dir):
+async def run_command(*cmd, log=None, **kwargs):
+    """
+    Run a command without blocking the event loop
+    
+    Output the command does not redirect elsewhere is captured, so it
+    cannot interleave with the report printed while it runs.
+    
+    Args:
+        *cmd: Program and its arguments
+        log: Optional list that receives the captured output lines
+        **kwargs: Passed through to asyncio.create_subprocess_exec
+    
+    Raises:
+        subprocess.CalledProcessError: If the command exits with non-zero status
+    """
+    kwargs.setdefault("stdout", asyncio.subprocess.PIPE)
+    kwargs.setdefault("stderr", asyncio.subprocess.PIPE)
+    proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+    stdout, stderr = await proc.communicate()
+    if log is not None:
+        for output in (stdout, stderr):
+            if output:
+                log.extend(output.decode(errors="replace").splitlines())
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+async def download_real_data(output_dir, log):
     """
     Download real sequencing data from ENA (European Nucleotide Archive)
     
+    Runs as a coroutine so the network-bound download can overlap with
+    local work on the event loop. Progress messages are appended to log
+    rather than printed, so they do not land in the middle of Part 1.
+    
     Args:
         output_dir: Directory to save downloaded files
+        log: List that receives the download's progress messages
         
     Returns:
         Path to downloaded FASTQ file
@@ -180,82 +268,163 @@ def download_real_data(output_dir):
     # Create output path
     fastq_gz = os.path.join(output_dir, f"{accession}.fastq.gz")
     
-    print(f"Downloading real sequencing data ({accession}) from ENA...")
+    log.append(f"Downloading real sequencing data ({accession}) from ENA in the background...")
     
     # Use fasterq-dump if available, otherwise use curl
     try:
         # Try using fasterq-dump (from SRA Toolkit)
-        subprocess.run(["fasterq-dump", "--progress", accession], check=True, cwd=output_dir)
-        # Compress to gzip
-        subprocess.run(["gzip", f"{accession}.fastq"], check=True, cwd=output_dir)
-        print("Download completed using fasterq-dump")
+        await run_command("fasterq-dump", accession, cwd=output_dir, log=log)
+        # Compress to gzip, in parallel with pigz if it is installed
+        try:
+            await run_command("pigz", "-p", str(os.cpu_count() or 4), f"{accession}.fastq",
+                              cwd=output_dir, log=log)
+        except FileNotFoundError:
+            await run_command("gzip", f"{accession}.fastq", cwd=output_dir, log=log)
+        log.append("Download completed using fasterq-dump")
     except (FileNotFoundError, subprocess.CalledProcessError):
         # Fallback to direct download
-        print("fasterq-dump not available, using direct download...")
+        log.append("fasterq-dump not available, using direct download...")
         try:
-            subprocess.run(["curl", "-o", fastq_gz, url], check=True)
-            print("Direct download completed")
+            # curl writes straight to the output file descriptor
+            with open(fastq_gz, "wb") as out:
+                await run_command("curl", "-s", url, stdout=out, log=log)
+            log.append("Direct download completed")
         except subprocess.CalledProcessError:
-            print("Failed to download real data. Using simulated data for demo.")
+            log.append("Failed to download real data. Using simulated data for demo.")
             return None
     
-    return fastq_gz
+    # Downstream steps read the file several times, so decompress it once
+    # with a parallel gzip decompressor when one is installed
+    fastq = await decompress_parallel(fastq_gz, log)
+    return fastq if fastq else fastq_gz
 
-def main():
-    """Main demo function"""
-    # Create temporary directory for files
-    with tempfile.TemporaryDirectory() as tmpdir:
-        print_header("TrimReads - High-Throughput Sequencing Data Quality Trimming")
-        print("This demo showcases the functionality of the TrimReads package.")
-        
-        # Part 1: Simulated Data Demo
-        print_header("Part 1: Simulated Data Demo")
-        sim_fastq = os.path.join(tmpdir, "simulated.fastq")
-        create_simulated_fastq(sim_fastq, num_reads=10000, read_length=150)
-        
-        # Show file stats before trimming
-        sim_stats = fastq_parser.calculate_file_stats(sim_fastq)
-        print("\nSimulated Data Statistics Before Trimming:")
-        print(f"  Total reads: {sim_stats['total_reads']}")
-        print(f"  Total bases: {sim_stats['total_bases']}")
-        print(f"  Average read length: {sim_stats['avg_length']:.1f} bp")
-        print(f"  Average quality: {sim_stats['avg_quality']:.2f}")
-        print(f"  Bases with Q<20: {sim_stats['low_quality_bases']} "
-              f"({sim_stats['low_quality_percent']:.2%})")
+async def decompress_parallel(gz_path, log):
+    """
+    Decompress a gzip file using all cores with rapidgzip or pugz
+    
+    Args:
+        gz_path: Path to gzip compressed FASTQ file
+        log: List that receives progress messages
         
+    Returns:
+        Path to decompressed FASTQ file, or None if no parallel
+        decompressor is available or decompression failed
+    """
+    threads = str(os.cpu_count() or 4)
+    if shutil.which("rapidgzip"):
+        cmd = ["rapidgzip", "-d", "-P", threads, "-c", gz_path]
+    elif shutil.which("pugz"):
+        cmd = ["pugz", "-t", threads, gz_path]
+    else:
+        return None
+    
+    fastq_path = gz_path[:-len(".gz")]
+    log.append(f"Decompressing with {cmd[0]} ({threads} threads)...")
+    try:
+        with open(fastq_path, "wb") as out:
+            await run_command(*cmd, stdout=out, log=log)
+    except subprocess.CalledProcessError:
+        log.append(f"{cmd[0]} failed, reading compressed file directly")
+        if os.path.exists(fastq_path):
+            os.remove(fastq_path)
+        return None
+    
+    return fastq_path
+
+def run_simulated_demo(tmpdir):
+    """
+    Part 1: create simulated data and run the trimming demos on it
+    
+    Args:
+        tmpdir: Directory for the simulated input and trimmed outputs
+    """
+    # Part 1: Simulated Data Demo
+    print_header("Part 1: Simulated Data Demo")
+    sim_fastq = os.path.join(tmpdir, "simulated.fastq")
+    create_simulated_fastq(sim_fastq, num_reads=10000, read_length=150)
+    
+    # Show file stats before trimming
+    sim_stats = fastq_parser.calculate_file_stats(sim_fastq)
+    print_block(
+        "\nSimulated Data Statistics Before Trimming:",
+        f"  Total reads: {sim_stats['total_reads']}",
+        f"  Total bases: {sim_stats['total_bases']}",
+        f"  Average read length: {sim_stats['avg_length']:.1f} bp",
+        f"  Average quality: {sim_stats['avg_quality']:.2f}",
+        f"  Bases with Q<20: {sim_stats['low_quality_bases']} "
+        f"({sim_stats['low_quality_percent']:.2%})"
+    )
+    
+    base_output = os.path.join(tmpdir, "base_trimmed.fastq")
+    window_output = os.path.join(tmpdir, "window_trimmed.fastq")
+    combined_output = os.path.join(tmpdir, "combined_trimmed.fastq")
+    # Split the CPUs between the three concurrent demos
+    threads = max(1, (os.cpu_count() or 1) // 3)
+    demos = [
         # Demo 1: Base-by-base trimming
-        print_header("Demo 1: Base-by-Base Trimming")
-        base_output = os.path.join(tmpdir, "base_trimmed.fastq")
-        run_trimming_demo(sim_fastq, base_output, method="base", threshold=25)
-        
+        ("Demo 1: Base-by-Base Trimming", base_output,
+         dict(method="base", threshold=25, input_stats=sim_stats,
+              threads=threads)),
         # Demo 2: Window-based trimming
-        print_header("Demo 2: Window-Based Trimming")
-        window_output = os.path.join(tmpdir, "window_trimmed.fastq")
-        run_trimming_demo(sim_fastq, window_output, method="window", threshold=20, window_size=10)
-        
+        ("Demo 2: Window-Based Trimming", window_output,
+         dict(method="window", threshold=20, window_size=10, input_stats=sim_stats,
+              threads=threads)),
         # Demo 3: Combined trimming
-        print_header("Demo 3: Combined Base and Window Trimming")
-        combined_output = os.path.join(tmpdir, "combined_trimmed.fastq")
-        run_trimming_demo(sim_fastq, combined_output, method="combined", threshold=25, window_size=10)
+        ("Demo 3: Combined Base and Window Trimming", combined_output,
+         dict(method="combined", threshold=25, window_size=10, input_stats=sim_stats,
+              threads=threads)),
+    ]
+    
+    # The demos share the input but write separate outputs, so run them
+    # concurrently and print each one's report in order. This runs in a
+    # worker thread next to the event loop, where forking is unsafe, so
+    # the pool spawns fresh interpreters instead
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(demos), mp_context=spawn) as executor:
+        futures = [
+            executor.submit(run_trimming_demo_captured, sim_fastq, output, **kwargs)
+            for _, output, kwargs in demos
+        ]
+        for (title, _, _), future in zip(demos, futures):
+            print_header(title)
+            _, report = future.result()
+            print(report, end="")
+    
+    # Visualize quality profiles
+    print_header("Quality Profile Visualization")
+    visualize_quality_profiles(sim_fastq, combined_output)
+
+async def run_demo():
+    """Run both demo parts, downloading real data while Part 1 runs"""
+    # Create temporary directory for files
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print_header("TrimReads - High-Throughput Sequencing Data Quality Trimming")
+        print("This demo showcases the functionality of the TrimReads package.")
         
-        # Visualize quality profiles
-        print_header("Quality Profile Visualization")
-        visualize_quality_profiles(sim_fastq, combined_output)
+        # The download is network bound, so start it first and run Part 1
+        # in a worker thread while it proceeds
+        download_log = []
+        download = asyncio.create_task(download_real_data(tmpdir, download_log))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, run_simulated_demo, tmpdir)
         
         # Part 2: Real-World Data Demo
         print_header("Part 2: Real-World Data Demo")
-        real_fastq = download_real_data(tmpdir)
+        real_fastq = await download
+        print_block(*download_log)
         
         if real_fastq and os.path.exists(real_fastq):
             # Show file stats before trimming
             real_stats = fastq_parser.calculate_file_stats(real_fastq)
-            print("\nReal Data Statistics Before Trimming:")
-            print(f"  Total reads: {real_stats['total_reads']}")
-            print(f"  Total bases: {real_stats['total_bases']}")
-            print(f"  Average read length: {real_stats['avg_length']:.1f} bp")
-            print(f"  Average quality: {real_stats['avg_quality']:.2f}")
-            print(f"  Bases with Q<20: {real_stats['low_quality_bases']} "
-                  f"({real_stats['low_quality_percent']:.2%})")
+            print_block(
+                "\nReal Data Statistics Before Trimming:",
+                f"  Total reads: {real_stats['total_reads']}",
+                f"  Total bases: {real_stats['total_bases']}",
+                f"  Average read length: {real_stats['avg_length']:.1f} bp",
+                f"  Average quality: {real_stats['avg_quality']:.2f}",
+                f"  Bases with Q<20: {real_stats['low_quality_bases']} "
+                f"({real_stats['low_quality_percent']:.2%})"
+            )
             
             # Trim real data
             print_header("Trimming Real Sequencing Data")
@@ -265,16 +434,23 @@ def main():
                 real_output, 
                 method="combined", 
                 threshold=25, 
-                window_size=10
+                window_size=10,
+                input_stats=real_stats
             )
         else:
             print("Skipping real data demo due to download issues.")
         
         print_header("Demo Complete")
-        print("All demo files were created in temporary directory and have been cleaned up.")
-        print("To use TrimReads with your own data:")
-        print("  trimreads -i input.fastq -o output.fastq --base_threshold 25 --window_size 10 --window_threshold 20")
-        print("\nFor more information, see the package documentation.")
+        print_block(
+            "All demo files were created in temporary directory and have been cleaned up.",
+            "To use TrimReads with your own data:",
+            "  trimreads -i input.fastq -o output.fastq --base_threshold 25 --window_size 10 --window_threshold 20",
+            "\nFor more information, see the package documentation."
+        )
+
+def main():
+    """Main demo function"""
+    asyncio.run(run_demo())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
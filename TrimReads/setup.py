@@ -1,8 +1,14 @@
 #!/usr/bin/env python
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 import os
 import re
 
+# Cython is optional; without it the pure-Python trimming code is used
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
 # Get package version
 VERSION = "1.0.0"
 #def get_version():
@@ -21,11 +27,26 @@ def get_long_description():
 
 # Package requirements
 requirements = [
-    'biopython>=1.79',
     'numpy>=1.21',
     'tqdm>=4.62',  # For progress bars
 ]
 
+# Compiled trimming kernel, parallelized across reads with OpenMP
+ext_modules = []
+if cythonize is not None:
+    ext_modules = cythonize(
+        [
+            Extension(
+                "trimreads._ctrim",
+                sources=["src/trimreads/_ctrim.pyx"],
+                extra_compile_args=["-O3", "-fopenmp"],
+                extra_link_args=["-fopenmp"],
+                optional=True,  # Fall back to pure Python if the build fails
+            )
+        ],
+        language_level=3,
+    )
+
 # Test requirements
 test_requirements = [
     'pytest>=6.2',
@@ -57,6 +78,7 @@ setup(
     ],
     package_dir={"": "src"},
     packages=find_packages(where="src"),
+    ext_modules=ext_modules,
     include_package_data=True,
     package_data={
         "trimreads": [
@@ -76,6 +98,8 @@ setup(
     },
     extras_require={
         "full": ["matplotlib", "seaborn"],  # For advanced visualization in demos
+        "fast": ["isal>=1.6", "numba>=0.56"],  # ISA-L gzip and JIT-compiled trimming
+        "bio": ["biopython>=1.79"],  # For Biopython-based downstream workflows
         "dev": test_requirements + [
             "flake8",
             "black",
@@ -84,11 +108,6 @@ setup(
             "sphinx_rtd_theme",
         ],
     },
-    options={
-        "bdist_wheel": {
-            "universal": True,
-        },
-    },
     license="MIT",
     keywords="bioinformatics sequencing fastq quality-trimming",
 )
\ No newline at end of file
@@ -29,28 +29,46 @@ Command-Line Tools:
     fastq_utils: FASTQ validation, filtering, and statistics
 """
 
-from . import trimreads
-from . import fastq_parser
+import importlib
 
-# Import core functions for direct access
-from .trimreads import (
-    base_trim,
-    window_trim,
-    process_fastq,
-    phred_to_score,
-    score_to_phred
-)
+# Core functions for direct access, mapped to the submodule defining them.
+# Submodules are imported lazily on first attribute access (PEP 562).
+_LAZY_ATTRS = {
+    'base_trim': 'trimreads',
+    'window_trim': 'trimreads',
+    'process_fastq': 'trimreads',
+    'phred_to_score': 'trimreads',
+    'score_to_phred': 'trimreads',
+    'FastqRecord': 'fastq_parser',
+    'FastqBatch': 'fastq_parser',
+    'FastqParser': 'fastq_parser',
+    'FastqWriter': 'fastq_parser',
+    'stream_fastq_records': 'fastq_parser',
+    'validate_fastq': 'fastq_parser',
+    'extract_quality_scores': 'fastq_parser',
+    'calculate_average_quality': 'fastq_parser',
+    'calculate_average_quality_batch': 'fastq_parser',
+    'filter_records': 'fastq_parser'
+}
 
-from .fastq_parser import (
-    FastqRecord,
-    FastqParser,
-    FastqWriter,
-    stream_fastq_records,
-    validate_fastq,
-    extract_quality_scores,
-    calculate_average_quality,
-    filter_records
-)
+_SUBMODULES = ('trimreads', 'fastq_parser')
+
+def __getattr__(name):
+    """Import submodules and re-exported symbols on first access"""
+    if name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # Package metadata
 __version__ = "1.0.0"
@@ -66,16 +84,13 @@ __all__ = [
     'phred_to_score',
     'score_to_phred',
     'FastqRecord',
+    'FastqBatch',
     'FastqParser',
     'FastqWriter',
     'stream_fastq_records',
     'validate_fastq',
     'extract_quality_scores',
     'calculate_average_quality',
+    'calculate_average_quality_batch',
     'filter_records'
 ]
-
-# Package initialization message
-print(f"Loaded TrimReads package v{__version__}")
-print("Available modules: trimreads, fastq_parser")
-print("Use help(trimreads) or help(fastq_parser) for more information")
\ No newline at end of file
@@ -0,0 +1,151 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled trimming kernels for TrimReads
+
+Computes the region kept from each read of a batch by base and window
+trimming. The per-read work runs without the GIL, so a batch is split
+across OpenMP threads with prange.
+"""
+
+from cython.parallel cimport prange
+from libc.stdlib cimport free, malloc
+
+cdef void _base_trim_c(const unsigned char* q, Py_ssize_t n, int threshold,
+                       Py_ssize_t* start_index, Py_ssize_t* end_index) noexcept nogil:
+    """Find the inclusive region kept by base trimming; start > end if none"""
+    cdef int cutoff = threshold + 33
+    cdef Py_ssize_t i
+
+    start_index[0] = 0
+    end_index[0] = -1
+    for i in range(n):
+        if q[i] >= cutoff:
+            start_index[0] = i
+            break
+
+    for i in range(n - 1, -1, -1):
+        if q[i] >= cutoff:
+            end_index[0] = i
+            break
+
+cdef void _window_trim_c(const unsigned char* q, Py_ssize_t n, int window_size, int threshold,
+                         Py_ssize_t* start_index, Py_ssize_t* end_index) noexcept nogil:
+    """Find the inclusive region kept by window trimming; -1 means discard"""
+    cdef long long cutoff = <long long>(threshold + 33) * window_size
+    cdef long long window_sum = 0
+    cdef Py_ssize_t i
+
+    # Find left trim position
+    for i in range(window_size):
+        window_sum += q[i]
+    start_index[0] = 0 if window_sum >= cutoff else -1
+    if start_index[0] < 0:
+        for i in range(window_size, n):
+            window_sum += q[i] - q[i - window_size]
+            if window_sum >= cutoff:
+                start_index[0] = i - window_size + 1
+                break
+        if start_index[0] < 0:
+            end_index[0] = -1
+            return
+
+    # Find right trim position
+    window_sum = 0
+    for i in range(n - window_size, n):
+        window_sum += q[i]
+    end_index[0] = n - 1 if window_sum >= cutoff else -1
+    if end_index[0] < 0:
+        for i in range(n - window_size - 1, -1, -1):
+            window_sum += q[i] - q[i + window_size]
+            if window_sum >= cutoff:
+                end_index[0] = i + window_size - 1
+                break
+        if end_index[0] < 0:
+            start_index[0] = -1
+
+cdef void _trim_read(const unsigned char* q, Py_ssize_t n,
+                     bint do_base, int base_threshold,
+                     bint do_window, int window_size, int window_threshold,
+                     Py_ssize_t* start, Py_ssize_t* stop) noexcept nogil:
+    """Apply base then window trimming; sets start to -1 for discarded reads"""
+    cdef Py_ssize_t s, e
+    start[0] = 0
+    stop[0] = n
+
+    if do_base:
+        _base_trim_c(q, n, base_threshold, &s, &e)
+        if s > e:
+            start[0] = -1
+            stop[0] = -1
+            return
+        start[0] = s
+        stop[0] = e + 1
+
+    if do_window:
+        # An empty read is discarded; reads shorter than the window are kept
+        if stop[0] == start[0]:
+            start[0] = -1
+            stop[0] = -1
+            return
+        if stop[0] - start[0] >= window_size:
+            _window_trim_c(q + start[0], stop[0] - start[0], window_size, window_threshold, &s, &e)
+            if s < 0:
+                start[0] = -1
+                stop[0] = -1
+                return
+            stop[0] = start[0] + e + 1
+            start[0] = start[0] + s
+
+def trim_batch(qualities, base_threshold, window_size, window_threshold, int num_threads=1):
+    """
+    Compute the region kept from each read by base and window trimming
+
+    Args:
+        qualities: Sequence of Phred+33 quality strings (str or bytes)
+        base_threshold: Quality threshold for base trimming, or None
+        window_size: Window size for window-based trimming, or None
+        window_threshold: Quality threshold for window-based trimming, or None
+        num_threads: Number of OpenMP threads
+
+    Returns:
+        List of (start, stop) slice bounds per read, (-1, -1) if discarded
+    """
+    cdef list encoded = [q.encode('ascii') if isinstance(q, str) else bytes(q) for q in qualities]
+    cdef Py_ssize_t n = len(encoded)
+    cdef Py_ssize_t i
+    cdef bytes quality
+    cdef bint do_base = base_threshold is not None
+    cdef bint do_window = window_size is not None and window_threshold is not None
+    cdef int bt = base_threshold if do_base else 0
+    cdef int ws = window_size if do_window else 0
+    cdef int wt = window_threshold if do_window else 0
+
+    cdef const unsigned char** ptrs = <const unsigned char**>malloc(n * sizeof(unsigned char*))
+    cdef Py_ssize_t* lengths = <Py_ssize_t*>malloc(n * sizeof(Py_ssize_t))
+    cdef Py_ssize_t* starts = <Py_ssize_t*>malloc(n * sizeof(Py_ssize_t))
+    cdef Py_ssize_t* stops = <Py_ssize_t*>malloc(n * sizeof(Py_ssize_t))
+    if n and not (ptrs and lengths and starts and stops):
+        free(ptrs)
+        free(lengths)
+        free(starts)
+        free(stops)
+        raise MemoryError()
+
+    try:
+        # Collect raw buffers while holding the GIL; encoded keeps them alive
+        for i in range(n):
+            quality = encoded[i]
+            ptrs[i] = <const unsigned char*>(<char*>quality)
+            lengths[i] = len(quality)
+
+        with nogil:
+            for i in prange(n, num_threads=max(num_threads, 1), schedule='static'):
+                _trim_read(ptrs[i], lengths[i], do_base, bt, do_window, ws, wt,
+                           &starts[i], &stops[i])
+
+        return [(starts[i], stops[i]) for i in range(n)]
+    finally:
+        free(ptrs)
+        free(lengths)
+        free(starts)
+        free(stops)
@@ -6,14 +6,268 @@ including support for compressed (.gz) files and streaming processing.
 """
 
 import gzip
+import io
 import os
+import random
+import shutil
+import subprocess
 import sys
 from collections import namedtuple
-from typing import Iterator, List, Optional, TextIO, Union
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, BinaryIO, Iterator, List, Optional, TextIO, Tuple, Union
+
+# NumPy and ISA-L are imported on first use, so plain parsing and
+# writing do not pay their import cost
+if TYPE_CHECKING:
+    import numpy as np
 
 # Define a named tuple for FASTQ records
 FastqRecord = namedtuple('FastqRecord', ['header', 'sequence', 'plus', 'quality'])
 
+@dataclass
+class FastqBatch:
+    """
+    A batch of FASTQ records stored as parallel columns.
+    
+    Kernels that only need one field (e.g. qualities) work on a single list
+    instead of unpacking every record. Indexing and iteration still return
+    FastqRecord objects, so a batch can be used like a list of records.
+    
+    Attributes:
+        headers (List[str]): Header lines
+        sequences (List[str]): Nucleotide sequences
+        pluses (List[str]): Separator lines
+        qualities (List[str]): Quality strings
+    """
+    headers: List[str] = field(default_factory=list)
+    sequences: List[str] = field(default_factory=list)
+    pluses: List[str] = field(default_factory=list)
+    qualities: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.headers)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FastqBatch(self.headers[index], self.sequences[index],
+                              self.pluses[index], self.qualities[index])
+        return FastqRecord(self.headers[index], self.sequences[index],
+                           self.pluses[index], self.qualities[index])
+    
+    def __iter__(self) -> Iterator[FastqRecord]:
+        return map(FastqRecord, self.headers, self.sequences, self.pluses, self.qualities)
+    
+    def append(self, record: FastqRecord):
+        """Add a record to the end of the batch"""
+        header, sequence, plus, quality = record
+        self.headers.append(header)
+        self.sequences.append(sequence)
+        self.pluses.append(plus)
+        self.qualities.append(quality)
+
+# Size of the binary blocks read from input files
+_READ_BUFFER = 1 << 20
+
+# Buffer sizes for gzip streams and plain files
+_GZIP_BUFFER = 128 * 1024
+_FILE_BUFFER = 1 << 20
+
+# Characters of formatted records FastqWriter collects before writing them
+_WRITE_BUFFER = 1 << 20
+
+class _PigzWriter:
+    """Text output handle that gzip-compresses through a separate pigz process"""
+    
+    def __init__(self, output_file: str, threads: int = 1):
+        self._raw = open(output_file, 'wb')
+        try:
+            self._proc = subprocess.Popen(['pigz', '-c', '-p', str(max(threads, 1))],
+                                          stdin=subprocess.PIPE, stdout=self._raw)
+        except BaseException:
+            self._raw.close()
+            raise
+        self._stdin = io.TextIOWrapper(self._proc.stdin, encoding='utf-8')
+    
+    def write(self, text: str) -> int:
+        return self._stdin.write(text)
+    
+    def close(self):
+        # Always reap pigz and close the file, even if flushing fails
+        # with BrokenPipeError because pigz exited early
+        try:
+            self._stdin.close()
+        finally:
+            try:
+                returncode = self._proc.wait()
+            finally:
+                self._raw.close()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, self._proc.args)
+
+@lru_cache(maxsize=None)
+def _gzip_modules():
+    """
+    Return the gzip implementation to use and ISA-L's igzip_threaded
+    
+    ISA-L accelerated gzip is preferred when available; without it the
+    standard gzip module is returned along with None. igzip_threaded is
+    also None on isal releases that predate it.
+    """
+    try:
+        from isal import igzip
+    except ImportError:
+        return gzip, None
+    try:
+        from isal import igzip_threaded
+    except ImportError:
+        return igzip, None
+    return igzip, igzip_threaded
+
+def _open_input(file_path: str, threads: int = 1) -> BinaryIO:
+    """
+    Open a FASTQ file for buffered binary reading, decompressing .gz files
+    
+    With threads > 1 and ISA-L available, gzip input is decompressed in a
+    background thread so decoding overlaps with parsing.
+    """
+    if not file_path.endswith('.gz'):
+        return open(file_path, 'rb', buffering=_FILE_BUFFER)
+    _gz, igzip_threaded = _gzip_modules()
+    if threads > 1 and igzip_threaded is not None:
+        return igzip_threaded.open(file_path, 'rb', threads=1)
+    return io.BufferedReader(_gz.open(file_path, 'rb'), buffer_size=_GZIP_BUFFER)
+
+def _open_output(file_path: str, compress: bool = False, threads: int = 1) -> TextIO:
+    """
+    Open a buffered text output handle, gzip compressing .gz files
+    
+    With threads > 1 and ISA-L available, 1 MiB blocks are compressed by
+    that many background threads. Otherwise compression runs in a pigz
+    subprocess when pigz is installed, so it proceeds in parallel with the
+    caller instead of on the main thread.
+    """
+    if not (compress or file_path.endswith('.gz')):
+        return open(file_path, 'w', buffering=_FILE_BUFFER)
+    _gz, igzip_threaded = _gzip_modules()
+    if threads > 1 and igzip_threaded is not None:
+        return io.TextIOWrapper(
+            igzip_threaded.open(file_path, 'wb', threads=threads, block_size=_FILE_BUFFER),
+            encoding='utf-8'
+        )
+    if shutil.which('pigz'):
+        return _PigzWriter(file_path, threads)
+    return io.TextIOWrapper(
+        io.BufferedWriter(_gz.open(file_path, 'wb'), buffer_size=_GZIP_BUFFER),
+        encoding='utf-8'
+    )
+
+def _iter_lines(handle) -> Iterator[str]:
+    """
+    Yield the lines of an open file without their trailing newline.
+    
+    The file is read in large binary blocks. Each block is cut at its last
+    newline, then decoded and split in a single pass, so there is no
+    per-line decoding or readline() call. Text handles are accepted too.
+    """
+    pending = b''
+    while True:
+        block = handle.read(_READ_BUFFER)
+        if not block:
+            break
+        if isinstance(block, str):
+            block = block.encode('utf-8')
+        if pending:
+            block = pending + block
+        
+        cut = block.rfind(b'\n')
+        if cut == -1:
+            # No complete line yet
+            pending = block
+            continue
+        pending = block[cut + 1:]
+        yield from block[:cut].decode('utf-8').split('\n')
+    
+    if pending:
+        yield pending.decode('utf-8')
+
+def _iter_record_lines(handle) -> Iterator[Tuple[List[str], int]]:
+    """
+    Group the lines of an open FASTQ file into four-line records.
+    
+    Blank lines between records are skipped, but blank lines inside a
+    record are kept, so reads with an empty sequence parse correctly.
+    
+    Yields:
+        Tuple of (record lines, line number the record ends on)
+    """
+    line_count = 0
+    record_lines = []
+    
+    for line in _iter_lines(handle):
+        line = line.strip()
+        line_count += 1
+        
+        if line or record_lines:  # Skip empty lines between records
+            record_lines.append(line)
+            
+            # Every 4 lines make a complete FASTQ record
+            if len(record_lines) == 4:
+                yield record_lines, line_count
+                record_lines = []
+
+def _validate_record(record_lines: List[str], line_count: int):
+    """Raise ValueError if four FASTQ lines ending at line_count are not a valid record"""
+    if not record_lines[0].startswith('@'):
+        raise ValueError(
+            f"Invalid FASTQ header at line {line_count-3}: {record_lines[0]}"
+            f"\nExpected header to start with '@'"
+            f"\nFull record: {record_lines}"
+        )
+    
+    if record_lines[2] != '+':
+        raise ValueError(
+            f"Invalid separator line at line {line_count-1}: {record_lines[2]}"
+            f"\nExpected '+'"
+            f"\nFull record: {record_lines}"
+        )
+    
+    if len(record_lines[1]) != len(record_lines[3]):
+        raise ValueError(
+            f"Sequence/quality length mismatch at line {line_count}"
+            f"\nSequence length: {len(record_lines[1])}"
+            f"\nQuality length: {len(record_lines[3])}"
+            f"\nFull record: {record_lines}"
+        )
+
+def _check_batch(batch: FastqBatch, check_separators: bool = True) -> bool:
+    """
+    Check every record of a batch at once with whole-column operations.
+    
+    Headers are joined and their '@' prefixes counted, separator lines are
+    counted with list.count and lengths are compared as lists, so the happy
+    path runs no per-record Python code. On False, callers check records
+    one by one to find and report the invalid ones.
+    
+    Args:
+        batch: FastqBatch to check
+        check_separators: If True, also require separator lines to be '+'
+        
+    Returns:
+        True if all records are valid, False otherwise
+    """
+    if not len(batch):
+        return True
+    
+    headers = "\n".join(batch.headers)
+    if not headers.startswith('@') or headers.count("\n@") != len(batch) - 1:
+        return False
+    
+    if check_separators and batch.pluses.count('+') != len(batch):
+        return False
+    
+    return list(map(len, batch.sequences)) == list(map(len, batch.qualities))
+
 class FastqParser:
     """
     A parser for FASTQ files with support for both plain text and gzip compressed files.
@@ -21,27 +275,28 @@ class FastqParser:
     Attributes:
         file_path (str): Path to the FASTQ file
         compressed (bool): True if file is gzip compressed
+        threads (int): Values above 1 decompress gzip input in a background thread
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, threads: int = 1):
         """
         Initialize the FASTQ parser.
         
         Args:
             file_path: Path to the FASTQ file (supports .gz extension for compressed files)
+            threads: Values above 1 decompress gzip input in a background
+                thread when ISA-L is installed
         """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"FASTQ file not found: {file_path}")
             
         self.file_path = file_path
         self.compressed = file_path.endswith('.gz')
+        self.threads = threads
     
     def __enter__(self):
         """Context manager entry: open the file"""
-        if self.compressed:
-            self.file_handle = gzip.open(self.file_path, 'rt')
-        else:
-            self.file_handle = open(self.file_path, 'r')
+        self.file_handle = _open_input(self.file_path, self.threads)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -58,49 +313,63 @@ class FastqParser:
         Raises:
             ValueError: If an invalid FASTQ record is encountered
         """
-        line_count = 0
-        record_lines = []
+        for batch in self.parse_batches():
+            yield from batch
+    
+    def parse_batches(self, batch_size: int = 1024, validate: bool = True) -> Iterator[FastqBatch]:
+        """
+        Parse the FASTQ file and yield batches of records.
         
-        for line in self.file_handle:
-            line = line.strip()
-            line_count += 1
+        Handing records over in batches lets callers filter, trim and write a
+        whole batch at a time instead of paying per-record call overhead.
+        
+        Args:
+            batch_size: Maximum number of records per batch
+            validate: If False, group lines into records without checking
+                them, leaving validation to the caller
             
-            if line:  # Skip empty lines
-                record_lines.append(line)
-                
-                # Every 4 lines make a complete FASTQ record
-                if len(record_lines) == 4:
-                    # Validate FASTQ record
-                    if not record_lines[0].startswith('@'):
-                        raise ValueError(
-                            f"Invalid FASTQ header at line {line_count-3}: {record_lines[0]}"
-                        f"\nExpected header to start with '@'"
-                        f"\nFull record: {record_lines}"
-                        )
-                    
-                    if record_lines[2] != '+':
-                        raise ValueError(
-                            f"Invalid separator line at line {line_count-1}: {record_lines[2]}"
-                            f"\nExpected '+'"
-                            f"\nFull record: {record_lines}"
-                        )
-                    
-                    if len(record_lines[1]) != len(record_lines[3]):
-                        raise ValueError(
-                            f"Sequence/quality length mismatch at line {line_count}"
-                            f"\nSequence length: {len(record_lines[1])}"
-                            f"\nQuality length: {len(record_lines[3])}"
-                            f"\nFull record: {record_lines}"
-                        )
-                    
-                    # Create record and reset buffer
-                    yield FastqRecord(
-                        header=record_lines[0],
-                        sequence=record_lines[1],
-                        plus=record_lines[2],
-                        quality=record_lines[3]
-                    )
-                    record_lines = []
+        Yields:
+            FastqBatch holding up to batch_size records
+            
+        Raises:
+            ValueError: If validate is True and an invalid FASTQ record is
+                encountered; records parsed before it are yielded first
+        """
+        for batch, line_ends in self._read_batches(batch_size):
+            if not validate:
+                yield batch
+            elif _check_batch(batch):
+                yield batch
+            else:
+                # Locate and report the first invalid record
+                for index, record in enumerate(batch):
+                    try:
+                        _validate_record(list(record), line_ends[index])
+                    except ValueError:
+                        if index:
+                            yield batch[:index]
+                        raise
+    
+    def _read_batches(self, batch_size: int) -> Iterator[Tuple[FastqBatch, List[int]]]:
+        """Group lines into batches of records, with the line number each record ends on"""
+        batch = FastqBatch()
+        line_ends = []
+        
+        for record_lines, line_count in _iter_record_lines(self.file_handle):
+            # Add record to the batch columns
+            batch.headers.append(record_lines[0])
+            batch.sequences.append(record_lines[1])
+            batch.pluses.append(record_lines[2])
+            batch.qualities.append(record_lines[3])
+            line_ends.append(line_count)
+            
+            if len(batch) == batch_size:
+                yield batch, line_ends
+                batch = FastqBatch()
+                line_ends = []
+        
+        if batch:
+            yield batch, line_ends
     
     def read_all(self) -> List[FastqRecord]:
         """
@@ -116,32 +385,60 @@ class FastqParser:
 class FastqWriter:
     """
     A writer for FASTQ files with support for both plain text and gzip compression.
+    
+    Formatted records are collected in memory and written in ~1 MiB chunks,
+    so the output handle sees one write call per chunk rather than per line.
     """
     
-    def __init__(self, output_path: str, compress: bool = False):
+    def __init__(self, output_path: str, compress: bool = False, threads: int = 1):
         """
         Initialize the FASTQ writer.
         
         Args:
             output_path: Path to the output FASTQ file
             compress: If True, compress the output with gzip
+            threads: Number of threads used for gzip compression
         """
         self.output_path = output_path
         self.compress = compress or output_path.endswith('.gz')
+        self.threads = threads
         self.file_handle = None
+        self._buffer = []
+        self._buffered = 0
     
     def __enter__(self):
         """Context manager entry: open the file"""
-        if self.compress:
-            self.file_handle = gzip.open(self.output_path, 'wt')
-        else:
-            self.file_handle = open(self.output_path, 'w')
+        self.file_handle = _open_output(self.output_path, self.compress, self.threads)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit: close the file"""
+        """Context manager exit: flush buffered records and close the file"""
         if self.file_handle:
-            self.file_handle.close()
+            try:
+                self.flush()
+            finally:
+                self.file_handle.close()
+    
+    def write_formatted(self, text: str):
+        """
+        Write text that already holds formatted FASTQ records.
+        
+        Text is buffered and written out once the buffer is full.
+        
+        Args:
+            text: One or more complete FASTQ records, newline terminated
+        """
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= _WRITE_BUFFER:
+            self.flush()
+    
+    def flush(self):
+        """Write all buffered records to the output file."""
+        if self._buffer:
+            self.file_handle.write("".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
     
     def write_record(self, record: FastqRecord):
         """
@@ -150,10 +447,7 @@ class FastqWriter:
         Args:
             record: FastqRecord to write
         """
-        self.file_handle.write(f"{record.header}\n")
-        self.file_handle.write(f"{record.sequence}\n")
-        self.file_handle.write(f"{record.plus}\n")
-        self.file_handle.write(f"{record.quality}\n")
+        self.write_formatted(f"{record.header}\n{record.sequence}\n{record.plus}\n{record.quality}\n")
     
     def write_records(self, records: List[FastqRecord]):
         """
@@ -162,8 +456,10 @@ class FastqWriter:
         Args:
             records: List of FastqRecord objects to write
         """
-        for record in records:
-            self.write_record(record)
+        self.write_formatted("".join(
+            f"{record.header}\n{record.sequence}\n{record.plus}\n{record.quality}\n"
+            for record in records
+        ))
 
 def stream_fastq_records(
     input_file: Union[str, TextIO],
@@ -194,62 +490,42 @@ def stream_fastq_records(
     
     # Handle input
     if isinstance(input_file, str):
-        if input_file.endswith('.gz'):
-            input_handle = gzip.open(input_file, 'rt')
-        else:
-            input_handle = open(input_file, 'r')
+        input_handle = _open_input(input_file)
     else:
         input_handle = input_file
     
     # Handle output
     if output_file:
         if isinstance(output_file, str):
-            if output_file.endswith('.gz'):
-                output_handle = gzip.open(output_file, 'wt')
-            else:
-                output_handle = open(output_file, 'w')
+            output_handle = _open_output(output_file)
         else:
             output_handle = output_file
     
     try:
-        record_lines = []
-        line_count = 0
-        
-        for line in input_handle:
-            line = line.strip()
-            line_count += 1
+        for record_lines, _ in _iter_record_lines(input_handle):
+            # Create record
+            record = FastqRecord(
+                header=record_lines[0],
+                sequence=record_lines[1],
+                plus=record_lines[2],
+                quality=record_lines[3]
+            )
             
-            if line:  # Skip empty lines
-                record_lines.append(line)
-                
-                # Every 4 lines make a complete FASTQ record
-                if len(record_lines) == 4:
-                    # Create record
-                    record = FastqRecord(
-                        header=record_lines[0],
-                        sequence=record_lines[1],
-                        plus=record_lines[2],
-                        quality=record_lines[3]
-                    )
-                    
-                    # Process record if function provided
-                    if process_func:
-                        processed_record = process_func(record)
-                    else:
-                        processed_record = record
-                    
-                    # Write to output if provided
-                    if output_handle:
-                        output_handle.write(f"{processed_record.header}\n")
-                        output_handle.write(f"{processed_record.sequence}\n")
-                        output_handle.write(f"{processed_record.plus}\n")
-                        output_handle.write(f"{processed_record.quality}\n")
-                    
-                    # Yield processed record
-                    yield processed_record
-                    
-                    # Reset buffer
-                    record_lines = []
+            # Process record if function provided
+            if process_func:
+                processed_record = process_func(record)
+            else:
+                processed_record = record
+            
+            # Write to output if provided
+            if output_handle:
+                output_handle.write(
+                    f"{processed_record.header}\n{processed_record.sequence}\n"
+                    f"{processed_record.plus}\n{processed_record.quality}\n"
+                )
+            
+            # Yield processed record
+            yield processed_record
     
     finally:
         # Clean up handles if we opened them
@@ -277,6 +553,15 @@ def validate_fastq(file_path: str) -> bool:
         print(f"Validation error: {str(e)}", file=sys.stderr)
         return False
 
+def _quality_bytes(record: FastqRecord) -> "np.ndarray":
+    """View the quality string of a record as an array of ASCII codes"""
+    import numpy as np
+    
+    quality = record.quality
+    if isinstance(quality, str):
+        quality = quality.encode('ascii')
+    return np.frombuffer(quality, dtype=np.uint8)
+
 def extract_quality_scores(record: FastqRecord) -> List[int]:
     """
     Extract quality scores from a FASTQ record (Sanger/Phred+33 encoding).
@@ -287,7 +572,9 @@ def extract_quality_scores(record: FastqRecord) -> List[int]:
     Returns:
         List of integer quality scores
     """
-    return [ord(char) - 33 for char in record.quality]
+    import numpy as np
+    
+    return np.subtract(_quality_bytes(record), 33, dtype=np.int16).tolist()
 
 def calculate_average_quality(record: FastqRecord) -> float:
     """
@@ -299,8 +586,103 @@ def calculate_average_quality(record: FastqRecord) -> float:
     Returns:
         Average quality score
     """
-    scores = extract_quality_scores(record)
-    return sum(scores) / len(scores) if scores else 0.0
+    codes = _quality_bytes(record)
+    if not len(codes):
+        return 0.0
+    # Subtract the offset from the mean rather than from every base
+    return float(codes.mean()) - 33
+
+def calculate_average_quality_batch(batch: FastqBatch) -> "np.ndarray":
+    """
+    Calculate the average quality score of every record in a batch.
+    
+    The quality column is joined into one contiguous array of codes and
+    per-record sums are taken from its cumulative sum at record boundaries.
+    
+    Args:
+        batch: FastqBatch of records
+        
+    Returns:
+        Array of average quality scores, 0.0 for empty records
+    """
+    import numpy as np
+    
+    codes = np.frombuffer("".join(batch.qualities).encode('ascii'), dtype=np.uint8)
+    lengths = np.fromiter(map(len, batch.qualities), dtype=np.int64, count=len(batch))
+    
+    ends = np.cumsum(lengths)
+    totals = np.concatenate(([0], np.cumsum(codes, dtype=np.int64)))
+    sums = totals[ends] - totals[ends - lengths]
+    
+    averages = np.zeros(len(batch))
+    np.divide(sums, lengths, out=averages, where=lengths > 0)
+    averages[lengths > 0] -= 33
+    return averages
+
+def calculate_file_stats(file_path: str, low_quality_threshold: int = 20) -> dict:
+    """
+    Calculate summary statistics for a FASTQ file.
+    
+    Args:
+        file_path: Path to the FASTQ file
+        low_quality_threshold: Bases scoring below this are counted as low quality
+        
+    Returns:
+        Dictionary with read, length and per-base quality statistics
+    """
+    import numpy as np
+    
+    total_reads = 0
+    total_bases = 0
+    quality_sum = 0
+    low_quality_bases = 0
+    
+    with FastqParser(file_path) as parser:
+        for batch in parser.parse_batches():
+            # All quality codes of the batch as one array
+            codes = np.frombuffer("".join(batch.qualities).encode('ascii'), dtype=np.uint8)
+            total_reads += len(batch)
+            total_bases += len(codes)
+            quality_sum += int(codes.sum(dtype=np.int64)) - 33 * len(codes)
+            low_quality_bases += int(np.count_nonzero(codes < low_quality_threshold + 33))
+    
+    return {
+        'total_reads': total_reads,
+        'total_bases': total_bases,
+        'avg_length': total_bases / total_reads if total_reads else 0.0,
+        'avg_quality': quality_sum / total_bases if total_bases else 0.0,
+        'low_quality_bases': low_quality_bases,
+        'low_quality_percent': low_quality_bases / total_bases if total_bases else 0.0
+    }
+
+def get_random_records(file_path: str, k: int) -> List[FastqRecord]:
+    """
+    Select k records uniformly at random from a FASTQ file.
+    
+    Uses reservoir sampling, so the file is read in a single sequential pass
+    and only k records are held in memory. This avoids counting records or
+    seeking, which is costly for gzip compressed input.
+    
+    Args:
+        file_path: Path to the FASTQ file
+        k: Number of records to select
+        
+    Returns:
+        List of up to k randomly selected FastqRecord objects
+    """
+    reservoir = []
+    
+    with FastqParser(file_path) as parser:
+        for i, record in enumerate(parser.parse()):
+            if i < k:
+                reservoir.append(record)
+            else:
+                # Replace an existing sample with probability k/(i+1)
+                j = random.randint(0, i)
+                if j < k:
+                    reservoir[j] = record
+    
+    return reservoir
 
 def filter_records(
     input_file: str,
@@ -331,35 +713,41 @@ def filter_records(
     }
     
     with FastqParser(input_file) as parser, FastqWriter(output_file) as writer:
-        for record in parser.parse():
-            stats['total'] += 1
+        for batch in parser.parse_batches():
+            stats['total'] += len(batch)
+            passed = []
             
-            # Calculate average quality
-            avg_quality = calculate_average_quality(record)
-            seq_length = len(record.sequence)
+            # Calculate average qualities for the whole batch
+            avg_qualities = calculate_average_quality_batch(batch)
             
-            # Apply filters
-            if avg_quality < min_quality:
-                stats['low_quality'] += 1
-                continue
-                
-            if seq_length < min_length:
-                stats['too_short'] += 1
-                continue
-                
-            if max_length is not None and seq_length > max_length:
-                stats['too_long'] += 1
-                continue
+            for record, avg_quality in zip(batch, avg_qualities.tolist()):
+                seq_length = len(record.sequence)
                 
-            # Write passing record
-            writer.write_record(record)
-            stats['passed'] += 1
+                # Apply filters
+                if avg_quality < min_quality:
+                    stats['low_quality'] += 1
+                    continue
+                    
+                if seq_length < min_length:
+                    stats['too_short'] += 1
+                    continue
+                    
+                if max_length is not None and seq_length > max_length:
+                    stats['too_long'] += 1
+                    continue
+                    
+                passed.append(record)
+            
+            # Write passing records of the batch at once
+            writer.write_records(passed)
+            stats['passed'] += len(passed)
     
     return stats
 
 if __name__ == '__main__':
     # Example usage
     import argparse
+    import numpy as np
     
     parser = argparse.ArgumentParser(description='FASTQ File Utilities')
     subparsers = parser.add_subparsers(dest='command', help='Sub-command help')
@@ -415,13 +803,14 @@ if __name__ == '__main__':
         quality_sum = 0.0
         
         with FastqParser(args.file) as parser:
-            for record in parser.parse():
-                total_records += 1
-                seq_len = len(record.sequence)
-                total_bases += seq_len
-                min_length = min(min_length, seq_len)
-                max_length = max(max_length, seq_len)
-                quality_sum += calculate_average_quality(record)
+            for batch in parser.parse_batches():
+                # Reduce each batch with NumPy instead of looping over records
+                lengths = np.fromiter(map(len, batch.sequences), dtype=np.int64, count=len(batch))
+                total_records += len(batch)
+                total_bases += int(lengths.sum())
+                min_length = min(min_length, int(lengths.min()))
+                max_length = max(max_length, int(lengths.max()))
+                quality_sum += float(calculate_average_quality_batch(batch).sum())
         
         avg_quality = quality_sum / total_records if total_records else 0
         avg_length = total_bases / total_records if total_records else 0
@@ -4,12 +4,25 @@ TrimReads - High-throughput sequencing data quality trimming tool
 Performs base-by-base and window-based quality trimming of FASTQ files
 """
 
-import argparse
 from collections import deque
-import gzip
+from contextlib import closing
+from functools import lru_cache, partial
 import os
+import queue
 import sys
-from typing import Tuple, Optional
+import threading
+from typing import TYPE_CHECKING, Callable, Iterator, List, Tuple, Optional
+
+try:
+    from . import _ctrim
+except ImportError:  # Compiled extension not built
+    _ctrim = None
+
+from .fastq_parser import FastqBatch, FastqParser, FastqWriter, _check_batch
+
+# NumPy is only needed for the Numba kernel and is imported on first use
+if TYPE_CHECKING:
+    import numpy as np
 
 def phred_to_score(char: str) -> int:
     """Convert Phred character to quality score (Sanger encoding)"""
@@ -19,6 +32,80 @@ def score_to_phred(score: int) -> str:
     """Convert quality score to Phred character (Sanger encoding)"""
     return chr(score + 33)
 
+# Phred+33 character code -> quality score, for bytes.translate
+_PHRED_LUT = bytes(max(code - 33, 0) for code in range(256))
+
+@lru_cache(maxsize=None)
+def _trim_mask_table(threshold: int) -> bytes:
+    """Translation table mapping Phred+33 codes to 1 if the score meets threshold, else 0"""
+    return bytes(1 if code - 33 >= threshold else 0 for code in range(256))
+
+def _window_trim_u8(qual, window_size, threshold):
+    """
+    Find the region kept by window trimming in an array of Phred+33 codes
+    
+    The window sum is updated incrementally and compared against
+    (threshold + 33) * window_size, so no averages are computed.
+    
+    Returns:
+        Tuple of (start_index, end_index), inclusive, or (-1, -1) if the
+        read should be discarded
+    """
+    n = qual.shape[0]
+    cutoff = (threshold + 33) * window_size
+    
+    # Find left trim position
+    window_sum = 0
+    for i in range(window_size):
+        window_sum += qual[i]
+    start_index = 0 if window_sum >= cutoff else -1
+    if start_index < 0:
+        for i in range(window_size, n):
+            window_sum += qual[i]
+            window_sum -= qual[i - window_size]
+            if window_sum >= cutoff:
+                start_index = i - window_size + 1
+                break
+        if start_index < 0:
+            return -1, -1
+    
+    # Find right trim position
+    window_sum = 0
+    for i in range(n - window_size, n):
+        window_sum += qual[i]
+    end_index = n - 1 if window_sum >= cutoff else -1
+    if end_index < 0:
+        for i in range(n - window_size - 1, -1, -1):
+            window_sum += qual[i]
+            window_sum -= qual[i + window_size]
+            if window_sum >= cutoff:
+                end_index = i + window_size - 1
+                break
+        if end_index < 0:
+            return -1, -1
+    
+    return start_index, end_index
+
+@lru_cache(maxsize=None)
+def _get_numba_trimmer():
+    """
+    Return the window trimming kernel compiled with Numba
+    
+    Numba is imported on the first call only. Without Numba, None is
+    returned and the pure-Python code path in window_trim is used.
+    """
+    try:
+        from numba import njit
+    except ImportError:  # Numba is optional
+        return None
+    return njit(cache=True)(_window_trim_u8)
+
+def _quality_codes(quality: str) -> "np.ndarray":
+    """View a quality string as an array of Phred+33 codes"""
+    import numpy as np
+    
+    return np.frombuffer(quality.encode('ascii'), dtype=np.uint8)
+
 def base_trim(sequence: str, quality: str, threshold: int) -> Tuple[str, str]:
     """
     Trim low-quality bases from both ends of a read
@@ -29,34 +116,21 @@ def base_trim(sequence: str, quality: str, threshold: int) -> Tuple[str, str]:
         threshold: Minimum quality score to keep
     
     Returns:
-        Tuple of (trimmed_sequence, trimmed_quality)
+        Tuple of (trimmed_sequence, trimmed_quality), empty if no base
+        meets the threshold
     """
-    # Convert to list for processing
-    seq_chars = list(sequence)
-    qual_chars = list(quality)
-    
-    # Find left trim position
-    start_index = 0
-    for i in range(len(seq_chars)):
-        if phred_to_score(qual_chars[i]) >= threshold:
-            start_index = i
-            break
+    # Mark bases meeting the threshold in one C-level pass
+    passing = quality.encode('ascii').translate(_trim_mask_table(threshold))
     
-    # Find right trim position
-    end_index = len(seq_chars) - 1
-    for i in range(len(seq_chars)-1, -1, -1):
-        if phred_to_score(qual_chars[i]) >= threshold:
-            end_index = i
-            break
+    # Trim to the first and last passing bases
+    start_index = passing.find(1)
+    end_index = passing.rfind(1)
     
     # Discard read if completely low quality
-    if start_index > end_index:
+    if start_index == -1:
         return "", ""
     
-    # Return trimmed sequences
-    trimmed_seq = "".join(seq_chars[start_index:end_index+1])
-    trimmed_qual = "".join(qual_chars[start_index:end_index+1])
-    return trimmed_seq, trimmed_qual
+    return sequence[start_index:end_index+1], quality[start_index:end_index+1]
 
 def window_trim(
     sequence: str, 
@@ -80,25 +154,31 @@ def window_trim(
     if len(sequence) < window_size:
         return sequence, quality
     
-    # Convert quality to scores
-    scores = [phred_to_score(q) for q in quality]
+    kernel = _get_numba_trimmer()
+    if kernel is not None:
+        start_index, end_index = kernel(_quality_codes(quality), window_size, threshold)
+        if start_index < 0:
+            return "", ""
+        return sequence[start_index:end_index+1], quality[start_index:end_index+1]
+    
+    # Convert quality to scores with a lookup table
+    scores = quality.encode('ascii').translate(_PHRED_LUT)
+    
+    # Windows are compared by integer sum to avoid dividing for the average
+    min_sum = threshold * window_size
     
     # Find left trim position
     start_index = 0
-    window = deque(scores[:window_size], maxlen=window_size)
-    window_avg = sum(window) / window_size
+    window_sum = sum(scores[:window_size])
     
-    if window_avg >= threshold:
-        start_index = 0
-    else:
+    if window_sum < min_sum:
         found = False
         for i in range(window_size, len(scores)):
-            # Update sliding window
-            window.append(scores[i])
-            window_avg = sum(window) / window_size
+            # Slide window right by one base
+            window_sum += scores[i] - scores[i - window_size]
             
             # Check if window meets threshold
-            if window_avg >= threshold:
+            if window_sum >= min_sum:
                 start_index = i - window_size + 1
                 found = True
                 break
@@ -109,20 +189,16 @@ def window_trim(
     
     # Find right trim position
     end_index = len(sequence) - 1
-    window = deque(scores[-window_size:], maxlen=window_size)
-    window_avg = sum(window) / window_size
+    window_sum = sum(scores[-window_size:])
     
-    if window_avg >= threshold:
-        end_index = len(sequence) - 1
-    else:
+    if window_sum < min_sum:
         found = False
         for i in range(len(scores)-window_size-1, -1, -1):
-            # Update sliding window
-            window.appendleft(scores[i])
-            window_avg = sum(window) / window_size
+            # Slide window left by one base
+            window_sum += scores[i] - scores[i + window_size]
             
             # Check if window meets threshold
-            if window_avg >= threshold:
+            if window_sum >= min_sum:
                 end_index = i + window_size - 1
                 found = True
                 break
@@ -136,13 +212,190 @@ def window_trim(
     trimmed_qual = quality[start_index:end_index+1]
     return trimmed_seq, trimmed_qual
 
+# Number of reads handed to a worker at a time when trimming in parallel
+BATCH_SIZE = 4096
+
+# Batches read ahead of trimming, and batches in flight per worker process
+PREFETCH_BATCHES = 4
+PENDING_BATCHES_PER_WORKER = 2
+
+def _prefetch(batches: Iterator, depth: int) -> Iterator:
+    """
+    Consume an iterator in a background thread, yielding its items in order
+    
+    At most depth items are buffered, which bounds memory while letting
+    decompression and parsing overlap with trimming on the main thread.
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+    
+    def reader():
+        try:
+            for item in batches:
+                items.put((item, None))
+                if stop.is_set():
+                    return
+        except BaseException as error:
+            items.put((None, error))
+        finally:
+            items.put((done, None))
+    
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+    finally:
+        # Unblock the reader if it is waiting on a full queue
+        stop.set()
+        while thread.is_alive():
+            try:
+                items.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+
+def _ordered_imap(pool, func, batches: Iterator, max_pending: int) -> Iterator:
+    """
+    Apply func to batches in a process pool, yielding results in input order
+    
+    Unlike Pool.imap, which submits every batch as fast as it can be read,
+    no more than max_pending batches are queued or running at once.
+    """
+    pending = deque()
+    for batch in batches:
+        pending.append(pool.apply_async(func, (batch,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+def _record_trimmer(
+    base_threshold: Optional[int],
+    window_size: Optional[int],
+    window_threshold: Optional[int]
+) -> Optional[Callable[[Tuple[str, str, str, str]], Optional[Tuple[str, str, str, str]]]]:
+    """
+    Build a function that trims one FASTQ record with fixed trimming options
+    
+    The options are checked once here instead of for every read, and each
+    combination gets its own function with no per-read option checks.
+    
+    Returns:
+        Function returning the trimmed record, or None if the read is
+        discarded; None if no trimming was requested
+    """
+    use_window = window_size is not None and window_threshold is not None
+    
+    if base_threshold is not None and use_window:
+        def trim(record):
+            header, sequence, plus_line, quality = record
+            sequence, quality = base_trim(sequence, quality, base_threshold)
+            if not sequence:  # Read discarded
+                return None
+            sequence, quality = window_trim(sequence, quality, window_size, window_threshold)
+            return (header, sequence, plus_line, quality) if sequence else None
+    elif base_threshold is not None:
+        def trim(record):
+            header, sequence, plus_line, quality = record
+            sequence, quality = base_trim(sequence, quality, base_threshold)
+            return (header, sequence, plus_line, quality) if sequence else None
+    elif use_window:
+        def trim(record):
+            header, sequence, plus_line, quality = record
+            sequence, quality = window_trim(sequence, quality, window_size, window_threshold)
+            return (header, sequence, plus_line, quality) if sequence else None
+    else:
+        return None
+    
+    return trim
+
+def _trim_batch(
+    batch: FastqBatch,
+    base_threshold: Optional[int],
+    window_size: Optional[int],
+    window_threshold: Optional[int],
+    min_length: int,
+    num_threads: int = 1
+) -> Tuple[int, str, int, int, List[Tuple[int, str, str]]]:
+    """
+    Validate and trim a batch of FASTQ records
+    
+    When the compiled extension is available, trim positions for the whole
+    batch are computed in one call, using num_threads OpenMP threads.
+    
+    Returns:
+        Tuple of (batch reads, output text, passed reads, discarded reads, warnings),
+        where warnings hold (index in batch, problem, detail) entries
+    """
+    output = []
+    passed = 0
+    discarded = 0
+    warnings = []
+    
+    # Check the whole batch at once; only a batch holding invalid records
+    # is checked record by record
+    if _check_batch(batch, check_separators=False):
+        records = batch
+    else:
+        records = FastqBatch()
+        for index, record in enumerate(batch):
+            header, sequence, plus_line, quality = record
+            
+            # Validate FASTQ record
+            if not header.startswith('@'):
+                warnings.append((index, "Invalid header", header))
+                continue
+                
+            if len(sequence) != len(quality):
+                warnings.append((index, "Length mismatch",
+                                 f"seq_len={len(sequence)}, qual_len={len(quality)}"))
+                continue
+            
+            records.append(record)
+    
+    trim = _record_trimmer(base_threshold, window_size, window_threshold)
+    if trim is None:
+        # Length filtering only
+        trimmed = records
+    elif _ctrim is not None:
+        spans = _ctrim.trim_batch(records.qualities, base_threshold,
+                                  window_size, window_threshold, num_threads)
+        trimmed = (
+            (header, sequence[start:stop], plus_line, quality[start:stop]) if start >= 0 else None
+            for (header, sequence, plus_line, quality), (start, stop) in zip(records, spans)
+        )
+    else:
+        trimmed = map(trim, records)
+    
+    for record in trimmed:
+        # Discard reads removed by trimming or below minimum length
+        if record is None or len(record[1]) < min_length:
+            discarded += 1
+            continue
+        
+        # Keep trimmed read
+        header, sequence, plus_line, quality = record
+        output.append(f"{header}\n{sequence}\n{plus_line}\n{quality}\n")
+        passed += 1
+    
+    return len(batch), "".join(output), passed, discarded, warnings
+
 def process_fastq(
     input_file: str,
     output_file: str,
     base_threshold: Optional[int] = None,
     window_size: Optional[int] = None,
     window_threshold: Optional[int] = None,
-    min_length: int = 30
+    min_length: int = 30,
+    threads: int = 1,
+    threads_out: int = 1
 ) -> dict:
     """
     Process FASTQ file with quality trimming
@@ -154,6 +407,11 @@ def process_fastq(
         window_size: Window size for window-based trimming
         window_threshold: Quality threshold for window-based trimming
         min_length: Minimum read length to keep
+        threads: Number of workers used for trimming: OpenMP threads when the
+            compiled extension is built, worker processes otherwise. Values
+            above 1 also read input in a background thread (and decompress
+            gzip input in another when ISA-L is installed)
+        threads_out: Number of threads compressing gzip output
     
     Returns:
         Dictionary with processing statistics
@@ -169,65 +427,59 @@ def process_fastq(
         'window_threshold': window_threshold
     }
     
-    # Open input file (handles gzipped files)
-    open_func = gzip.open if input_file.endswith('.gz') else open
-    in_mode = 'rt' if input_file.endswith('.gz') else 'r'
+    # The compiled extension trims a batch across threads without the GIL,
+    # so worker processes are only needed for the pure-Python path
+    use_pool = threads > 1 and _ctrim is None
     
-    # Open output file
-    out_mode = 'wt' if output_file.endswith('.gz') else 'w'
-    output_handle = gzip.open(output_file, out_mode) if output_file.endswith('.gz') else open(output_file, out_mode)
+    trim = partial(
+        _trim_batch,
+        base_threshold=base_threshold,
+        window_size=window_size,
+        window_threshold=window_threshold,
+        min_length=min_length,
+        num_threads=1 if use_pool else threads
+    )
     
-    with open_func(input_file, in_mode) as f:
-        while True:
-            # Read FASTQ record (4 lines per read)
-            header = f.readline().rstrip()
-            if not header:
-                break  # End of file
-                
-            sequence = f.readline().rstrip()
-            plus_line = f.readline().rstrip()
-            quality = f.readline().rstrip()
-            
-            stats['total_reads'] += 1
-            
-            # Validate FASTQ record
-            if not header.startswith('@'):
-                sys.stderr.write(f"Warning: Invalid header at read {stats['total_reads']}: {header}\n")
-                continue
-                
-            if len(sequence) != len(quality):
-                sys.stderr.write(f"Warning: Length mismatch at read {stats['total_reads']}: "
-                                 f"seq_len={len(sequence)}, qual_len={len(quality)}\n")
-                continue
-            
-            # Apply base trimming if requested
-            if base_threshold is not None:
-                sequence, quality = base_trim(sequence, quality, base_threshold)
-                if not sequence:  # Read discarded
-                    stats['discarded_reads'] += 1
-                    continue
-            
-            # Apply window trimming if requested
-            if window_size is not None and window_threshold is not None:
-                sequence, quality = window_trim(sequence, quality, window_size, window_threshold)
-                if not sequence:  # Read discarded
-                    stats['discarded_reads'] += 1
-                    continue
+    if use_pool:
+        import multiprocessing
+        pool = multiprocessing.Pool(threads)
+    else:
+        pool = None
+    try:
+        with FastqParser(input_file, threads) as parser, FastqWriter(output_file, threads=threads_out) as writer:
+            # Records are validated by _trim_batch, which warns about and skips bad ones
+            batches = parser.parse_batches(BATCH_SIZE, validate=False)
+            if threads > 1:
+                # Read and parse the next batches while the current ones are trimmed
+                batches = _prefetch(batches, PREFETCH_BATCHES)
             
-            # Discard reads below minimum length
-            if len(sequence) < min_length:
-                stats['discarded_reads'] += 1
-                continue
+            # Batches are trimmed independently; results come back in input order
+            if pool:
+                results = _ordered_imap(pool, trim, batches,
+                                        threads * PENDING_BATCHES_PER_WORKER)
+            else:
+                results = map(trim, batches)
             
-            # Write trimmed read to output
-            output_handle.write(f"{header}\n{sequence}\n{plus_line}\n{quality}\n")
-            stats['passed_reads'] += 1
+            # Close explicitly so the reader thread stops before the input is closed
+            with closing(batches):
+                for batch_reads, output, passed, discarded, warnings in results:
+                    for index, problem, detail in warnings:
+                        sys.stderr.write(f"Warning: {problem} at read "
+                                         f"{stats['total_reads'] + index + 1}: {detail}\n")
+                    stats['total_reads'] += batch_reads
+                    writer.write_formatted(output)
+                    stats['passed_reads'] += passed
+                    stats['discarded_reads'] += discarded
+    finally:
+        if pool:
+            pool.terminate()
     
-    output_handle.close()
     return stats
 
 def main():
     """Command-line interface for TrimReads"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Quality trimming for FASTQ files',
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -245,6 +497,10 @@ def main():
                         help='Quality threshold for window-based trimming')
     parser.add_argument('--min_length', type=int, default=30,
                         help='Minimum read length to keep after trimming')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='Number of threads/processes used for trimming and input decompression')
+    parser.add_argument('--threads_out', '--threads-out', type=int, default=1,
+                        help='Number of threads for gzip output compression')
     
     args = parser.parse_args()
     
@@ -266,7 +522,9 @@ def main():
         base_threshold=args.base_threshold,
         window_size=args.window_size,
         window_threshold=args.window_threshold,
-        min_length=args.min_length
+        min_length=args.min_length,
+        threads=args.threads,
+        threads_out=args.threads_out
     )
     
     # Print summary statistics